@@ -1,7 +1,10 @@
+import decimal
+import itertools
 import logging
 import os
 
-from flask import Flask, jsonify, request
+import orjson
+from flask import Flask, Response, request, stream_with_context
 from flask_cors import CORS
 from postgresql_connection_handler import PostgreSQLConnectionHandler
 from sqlglotparser.sqlglot_parser import SQLGlotParser
@@ -18,10 +21,24 @@ connection_handler = PostgreSQLConnectionHandler()
 sql_translator_parser = SQLGlotParser()
 
 
+def _orjson_default(obj):
+    """Serialize values orjson does not support natively"""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _jsonify(payload):
+    """Build a JSON response, encoding it with orjson"""
+    return app.response_class(
+        orjson.dumps(payload, default=_orjson_default), mimetype="application/json"
+    )
+
+
 @app.route("/health", methods=["GET"])
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "service": "snowflake-localhost-proxy"})
+    return _jsonify({"status": "healthy", "service": "snowflake-localhost-proxy"})
 
 
 @app.route("/v1/connection", methods=["POST"])
@@ -29,7 +46,7 @@ def create_connection():
     """Handle Snowflake connection requests"""
     try:
         data = request.get_json()
-        logger.info(f"Received connection request: {data}")
+        logger.info("Received connection request: %s", data)
 
         # Extract connection parameters
         connection_params = {
@@ -46,7 +63,7 @@ def create_connection():
         # Create connection
         connection_id = connection_handler.create_connection(connection_params)
 
-        return jsonify(
+        return _jsonify(
             {
                 "success": True,
                 "connection_id": connection_id,
@@ -55,8 +72,8 @@ def create_connection():
         )
 
     except Exception as e:
-        logger.error(f"Error creating connection: {str(e)}")
-        return jsonify({"success": False, "error": str(e)}), 500
+        logger.error("Error creating connection: %s", e)
+        return _jsonify({"success": False, "error": str(e)}), 500
 
 
 @app.route("/v1/query", methods=["POST"])
@@ -64,7 +81,7 @@ def execute_query():
     """Handle Snowflake query execution"""
     try:
         data = request.get_json()
-        logger.info(f"Received query request: {data}")
+        logger.info("Received query request: %s", data)
 
         # Before stablishing connection with Postgresql we check
         # that the query is properly parsed
@@ -78,7 +95,7 @@ def execute_query():
 
         if not connection_id or not query:
             return (
-                jsonify(
+                _jsonify(
                     {"success": False, "error": "connection_id and query are required"}
                 ),
                 400,
@@ -89,14 +106,14 @@ def execute_query():
 
         # Translate Snowflake SQL to PostgreSQL
 
-        logger.info(f"Translated query: {translated_query}")
+        logger.info("Translated query: %s", translated_query)
 
         # Execute query
         result = connection_handler.execute_query(
             connection_id, translated_query, params
         )
 
-        return jsonify(
+        return _jsonify(
             {
                 "success": True,
                 "result": result,
@@ -106,8 +123,126 @@ def execute_query():
         )
 
     except Exception as e:
-        logger.error(f"Error executing query: {str(e)}")
-        return jsonify({"success": False, "error": str(e)}), 500
+        logger.error("Error executing query: %s", e)
+        return _jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route("/v1/query_stream", methods=["POST"])
+def stream_query():
+    """Handle Snowflake query execution, streaming rows as JSON lines"""
+    try:
+        data = request.get_json()
+        logger.info("Received query stream request: %s", data)
+
+        connection_id = data.get("connection_id")
+        query = data.get("query")
+        params = data.get("params")
+
+        if not connection_id or not query:
+            return (
+                _jsonify(
+                    {"success": False, "error": "connection_id and query are required"}
+                ),
+                400,
+            )
+
+        # Translate Snowflake SQL to PostgreSQL
+        result = sql_translator_parser.parse(query, target_dialect="postgres")
+        translated_query = result["translated_sql"]
+
+        logger.info("Translated query: %s", translated_query)
+
+        rows = connection_handler.stream_query(connection_id, translated_query, params)
+
+        # Pull the first row here so execution errors still get a JSON response
+        first_row = next(rows, None)
+
+    except Exception as e:
+        logger.error("Error streaming query: %s", e)
+        return _jsonify({"success": False, "error": str(e)}), 500
+
+    def generate():
+        if first_row is None:
+            return
+        for row in itertools.chain([first_row], rows):
+            yield orjson.dumps(row, default=_orjson_default) + b"\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+@app.route("/v1/query_batch", methods=["POST"])
+def execute_query_batch():
+    """Handle execution of several Snowflake queries in one request"""
+    try:
+        data = request.get_json()
+        logger.info("Received query batch request: %s", data)
+
+        connection_id = data.get("connection_id")
+        queries = data.get("queries")
+
+        if not connection_id or not queries:
+            return (
+                _jsonify(
+                    {
+                        "success": False,
+                        "error": "connection_id and queries are required",
+                    }
+                ),
+                400,
+            )
+
+        # Queries are either plain strings or {"query": ..., "params": ...}
+        if not isinstance(queries, list) or not all(
+            isinstance(entry, str)
+            or (isinstance(entry, dict) and isinstance(entry.get("query"), str))
+            for entry in queries
+        ):
+            return (
+                _jsonify(
+                    {
+                        "success": False,
+                        "error": "queries must be a list of query strings "
+                        'or of objects with a "query" string',
+                    }
+                ),
+                400,
+            )
+
+        statements = [
+            entry if isinstance(entry, dict) else {"query": entry} for entry in queries
+        ]
+
+        # Translate Snowflake SQL to PostgreSQL
+        translated_queries = [
+            sql_translator_parser.parse(statement["query"], target_dialect="postgres")[
+                "translated_sql"
+            ]
+            for statement in statements
+        ]
+
+        logger.info("Translated queries: %s", translated_queries)
+
+        # Execute every query on the same connection in a single pipeline
+        results = connection_handler.execute_batch(
+            connection_id,
+            [
+                (translated_query, statement.get("params"))
+                for translated_query, statement in zip(translated_queries, statements)
+            ],
+        )
+
+        return _jsonify(
+            {
+                "success": True,
+                "results": results,
+                "original_queries": [statement["query"] for statement in statements],
+                "translated_queries": translated_queries,
+            }
+        )
+
+    except Exception as e:
+        logger.error("Error executing query batch: %s", e)
+        return _jsonify({"success": False, "error": str(e)}), 500
 
 
 @app.route("/v1/connection/<connection_id>", methods=["DELETE"])
@@ -115,7 +250,7 @@ def close_connection(connection_id):
     """Close a connection"""
     try:
         connection_handler.close_connection(connection_id)
-        return jsonify(
+        return _jsonify(
             {
                 "success": True,
                 "message": f"Connection {connection_id} closed successfully",
@@ -123,8 +258,8 @@ def close_connection(connection_id):
         )
 
     except Exception as e:
-        logger.error(f"Error closing connection: {str(e)}")
-        return jsonify({"success": False, "error": str(e)}), 500
+        logger.error("Error closing connection: %s", e)
+        return _jsonify({"success": False, "error": str(e)}), 500
 
 
 if __name__ == "__main__":
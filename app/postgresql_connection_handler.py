@@ -1,18 +1,27 @@
 import os
 import uuid
 import logging
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from typing import Dict, Any, Optional
+import threading
+import psycopg
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool, PoolTimeout
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+def _reset_connection(connection: psycopg.Connection) -> None:
+    """Clear the session state a client left on a connection returned to the pool"""
+    # DISCARD ALL cannot run inside a transaction block
+    connection.autocommit = True
+    connection.execute("DISCARD ALL")
+
+
 class PostgreSQLConnectionHandler:
     """Handles PostgreSQL connections while mimicking Snowflake connection behavior"""
 
     def __init__(self):
-        self.connections: Dict[str, psycopg2.extensions.connection] = {}
+        self.connections: Dict[str, psycopg.Connection] = {}
         self.connection_params: Dict[str, Dict[str, Any]] = {}
 
         # PostgreSQL connection parameters
@@ -22,36 +31,87 @@ class PostgreSQLConnectionHandler:
         self.pg_user = os.environ.get("POSTGRES_USER", "snowflake_user")
         self.pg_password = os.environ.get("POSTGRES_PASSWORD", "snowflake_password")
 
+        # Connection pool parameters
+        self.pool_min_size = int(os.environ.get("POSTGRES_POOL_MIN_SIZE", "4"))
+        self.pool_max_size = int(os.environ.get("POSTGRES_POOL_MAX_SIZE", "32"))
+        self.pool_max_age = float(os.environ.get("POSTGRES_POOL_MAX_AGE", "300"))
+        self.pool_timeout = float(os.environ.get("POSTGRES_POOL_TIMEOUT", "5"))
+
+        # The pool is created on first use so the proxy can start before
+        # PostgreSQL is accepting connections
+        self._pool: Optional[ConnectionPool] = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> ConnectionPool:
+        """Return the shared connection pool, creating it if needed"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # max_lifetime recycles connections older than the max age,
+                    # and reset clears SET, temp tables and prepared statements
+                    # before a connection is handed to another client
+                    self._pool = ConnectionPool(
+                        kwargs={
+                            "host": self.pg_host,
+                            "port": self.pg_port,
+                            "dbname": self.pg_db,
+                            "user": self.pg_user,
+                            "password": self.pg_password,
+                        },
+                        min_size=self.pool_min_size,
+                        max_size=self.pool_max_size,
+                        max_lifetime=self.pool_max_age,
+                        reset=_reset_connection,
+                        open=True,
+                    )
+        return self._pool
+
     def create_connection(self, connection_params: Dict[str, Any]) -> str:
         """Create a PostgreSQL connection and return a connection ID"""
         try:
             # Generate unique connection ID
             connection_id = str(uuid.uuid4())
 
+            # Check out a PostgreSQL connection from the pool. Connections stay
+            # checked out until the client closes them, so fail fast rather
+            # than hold a request thread while the pool is exhausted
+            pool = self._get_pool()
+            try:
+                pg_connection = pool.getconn(timeout=self.pool_timeout)
+            except PoolTimeout as e:
+                # The timeout also fires when PostgreSQL cannot be reached, so
+                # only blame exhaustion when every pooled connection is taken
+                stats = pool.get_stats()
+                if (
+                    stats.get("pool_size", 0) >= self.pool_max_size
+                    and stats.get("pool_available", 0) == 0
+                ):
+                    raise RuntimeError(
+                        f"No PostgreSQL connection available after "
+                        f"{self.pool_timeout:g}s: all {self.pool_max_size} pooled "
+                        f"connections are in use, close unused connections"
+                    ) from e
+                raise RuntimeError(
+                    f"Could not get a PostgreSQL connection after "
+                    f"{self.pool_timeout:g}s, check that PostgreSQL is reachable "
+                    f"at {self.pg_host}:{self.pg_port}"
+                ) from e
+
             # Store connection parameters
             self.connection_params[connection_id] = connection_params
 
-            # Create PostgreSQL connection
-            pg_connection = psycopg2.connect(
-                host=self.pg_host,
-                port=self.pg_port,
-                database=self.pg_db,
-                user=self.pg_user,
-                password=self.pg_password,
-            )
-
-            # Set autocommit if specified
-            if connection_params.get("autocommit", True):
-                pg_connection.autocommit = True
+            # Pooled connections keep their previous autocommit mode,
+            # so always set it explicitly
+            pg_connection.autocommit = bool(connection_params.get("autocommit", True))
 
             # Store connection
             self.connections[connection_id] = pg_connection
 
-            logger.info(f"Created connection {connection_id}")
+            logger.info("Created connection %s", connection_id)
             return connection_id
 
         except Exception as e:
-            logger.error(f"Error creating connection: {str(e)}")
+            logger.error("Error creating connection: %s", e)
             raise
 
     def execute_query(
@@ -63,39 +123,106 @@ class PostgreSQLConnectionHandler:
 
         try:
             connection = self.connections[connection_id]
-            cursor = connection.cursor(cursor_factory=RealDictCursor)
+            cursor = connection.cursor(row_factory=dict_row)
 
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
 
-            # Try to fetch results (for SELECT queries)
-            try:
-                results = cursor.fetchall()
-                # Convert to list of dicts for JSON serialization
-                return [dict(row) for row in results]
-            except psycopg2.ProgrammingError:
-                # No results to fetch (INSERT, UPDATE, DELETE, etc.)
-                return {"affected_rows": cursor.rowcount}
+            return self._fetch_result(cursor)
 
         except Exception as e:
-            logger.error(f"Error executing query: {str(e)}")
+            logger.error("Error executing query: %s", e)
             raise
         finally:
             if "cursor" in locals():
                 cursor.close()
 
+    def execute_batch(
+        self, connection_id: str, queries: List[Tuple[str, Optional[list]]]
+    ) -> List[Any]:
+        """Execute several queries on the specified connection in one pipeline"""
+        if connection_id not in self.connections:
+            raise ValueError(f"Connection {connection_id} not found")
+
+        cursors = []
+        try:
+            connection = self.connections[connection_id]
+
+            # Pipeline mode sends every statement before waiting for results,
+            # so the batch costs a single round trip to PostgreSQL
+            with connection.pipeline():
+                for query, params in queries:
+                    cursor = connection.cursor(row_factory=dict_row)
+                    cursors.append(cursor)
+                    cursor.execute(query, params or None)
+
+            return [self._fetch_result(cursor) for cursor in cursors]
+
+        except Exception as e:
+            logger.error("Error executing batch: %s", e)
+            raise
+        finally:
+            for cursor in cursors:
+                cursor.close()
+
+    def stream_query(
+        self,
+        connection_id: str,
+        query: str,
+        params: Optional[list] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream the rows of a query on the specified connection"""
+        if connection_id not in self.connections:
+            raise ValueError(f"Connection {connection_id} not found")
+
+        return self._stream_rows(
+            self.connections[connection_id], query, params, batch_size
+        )
+
+    def _stream_rows(
+        self,
+        connection: psycopg.Connection,
+        query: str,
+        params: Optional[list],
+        batch_size: int,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield rows from a server-side cursor, fetching batch_size at a time"""
+        try:
+            # Server-side cursors only live inside a transaction
+            with connection.transaction():
+                with connection.cursor(
+                    name=f"s_{uuid.uuid4().hex}", row_factory=dict_row
+                ) as cursor:
+                    cursor.itersize = batch_size
+                    cursor.execute(query, params or None)
+                    yield from cursor
+
+        except Exception as e:
+            logger.error("Error streaming query: %s", e)
+            raise
+
+    def _fetch_result(self, cursor: psycopg.Cursor) -> Any:
+        """Fetch the result of the last query executed on a cursor"""
+        if cursor.description is None:
+            # No results to fetch (INSERT, UPDATE, DELETE, etc.)
+            return {"affected_rows": cursor.rowcount}
+
+        # dict_row already yields plain dicts, ready for JSON serialization
+        return cursor.fetchall()
+
     def close_connection(self, connection_id: str) -> None:
         """Close a connection"""
         if connection_id in self.connections:
             try:
-                self.connections[connection_id].close()
+                self._get_pool().putconn(self.connections[connection_id])
                 del self.connections[connection_id]
                 del self.connection_params[connection_id]
-                logger.info(f"Closed connection {connection_id}")
+                logger.info("Closed connection %s", connection_id)
             except Exception as e:
-                logger.error(f"Error closing connection {connection_id}: {str(e)}")
+                logger.error("Error closing connection %s: %s", connection_id, e)
                 raise
         else:
             raise ValueError(f"Connection {connection_id} not found")
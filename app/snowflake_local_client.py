@@ -1,7 +1,11 @@
 import logging
-from typing import Any
+import re
+import time
+from typing import Any, Iterator
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 # return snowflake.connector.connect(
 #         user=self.user,
@@ -15,6 +19,13 @@ import requests
 #         session_parameters=session_parameters,
 #     )
 
+# Seconds that table introspection results are reused before being refreshed
+_SCHEMA_CACHE_TTL = 60
+
+# Statements that may change a table's columns or constraints, at the start
+# of a query or of any later statement in a multi-statement query
+_DDL_RE = re.compile(r"(?:^|;)\s*(CREATE|ALTER|DROP)\b", re.IGNORECASE)
+
 
 class SnowflakeMockClient:
     """Modified Snowflake client that connects to local PostgreSQL proxy"""
@@ -43,6 +54,17 @@ class SnowflakeMockClient:
         self.connection_id = None
         self.pkb = None
 
+        # Introspection results per table, as (fetched_at, rows)
+        self._columns_cache: dict[str, tuple[float, list[dict]]] = {}
+        self._primary_key_cache: dict[str, tuple[float, list[dict]]] = {}
+
+        # Reuse HTTP connections to the proxy across requests
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
         if private_key_path:
             # For local development, we'll skip private key handling
             # but keep the interface compatible
@@ -65,20 +87,21 @@ class SnowflakeMockClient:
                 "session_parameters": session_parameters,
             }
 
-            response = requests.post(
+            response = self.session.post(
                 f"{self.proxy_url}/v1/connection",
                 json=connection_params,
-                headers={"Content-Type": "application/json"},
             )
 
             if response.status_code != 200:
                 raise Exception(f"Failed to create connection: {response.text}")
 
-            result = response.json()
+            result = orjson.loads(response.content)
             self.connection_id = result["connection_id"]
-            self.log.info(f"Created local connection: {self.connection_id}")
+            self.log.info("Created local connection: %s", self.connection_id)
 
-        return SnowflakeMockConnection(self.connection_id, self.proxy_url, self.log)
+        return SnowflakeMockConnection(
+            self.connection_id, self.proxy_url, self.log, self.session
+        )
 
     def execute_query(
         self,
@@ -95,20 +118,68 @@ class SnowflakeMockClient:
             self.log.info("::group::Local Snowflake query")
             self.log.info(query)
             if data is not None:
-                self.log.info(f"Data: {data}")
+                self.log.info("Data: %s", data)
             self.log.info("::endgroup::")
 
+        if _DDL_RE.search(query):
+            self.invalidate()
+
         with self._get_connection(autocommit, session_parameters) as ctx:
             return ctx.execute_query(query, data, return_dict)
 
+    def execute_many(
+        self,
+        queries: list[str | tuple[str, Any]],
+        autocommit: bool = True,
+        session_parameters: Any = None,
+        batch_size: int = 500,
+        verbose: bool = True,
+    ) -> list[Any]:
+        """Execute several queries, sending up to batch_size per proxy request.
+
+        Each query is either a SQL string or a (query, data) tuple. Results
+        are returned in the same order as the queries.
+        """
+        if verbose:
+            self.log.info("::group::Local Snowflake query batch")
+            self.log.info("%s queries", len(queries))
+            self.log.info("::endgroup::")
+
+        if any(
+            _DDL_RE.search(query if isinstance(query, str) else query[0])
+            for query in queries
+        ):
+            self.invalidate()
+
+        results = []
+        with self._get_connection(autocommit, session_parameters) as ctx:
+            for start in range(0, len(queries), batch_size):
+                results.extend(ctx.execute_many(queries[start : start + batch_size]))
+        return results
+
+    def stream_query(
+        self,
+        query: str,
+        autocommit: bool = True,
+        session_parameters: Any = None,
+        data: list[str] | dict[str, Any] | None = None,
+    ) -> Iterator[dict]:
+        """Execute a query and yield its rows as they arrive from the proxy"""
+        with self._get_connection(autocommit, session_parameters) as ctx:
+            yield from ctx.stream_query(query, data)
+
     def get_columns_info(
         self, table: str, exclude_ts_ms_column: bool = False
     ) -> list[dict]:
         """Get column information for a table"""
-        describe_query = f"SELECT column_name, data_type, is_nullable, column_default FROM information_schema.columns WHERE table_name = '{table}'"
+        # The table name is bound rather than interpolated so the query text
+        # stays constant and PostgreSQL can reuse its prepared plan
+        describe_query = (
+            "SELECT column_name, data_type, is_nullable, column_default "
+            "FROM information_schema.columns WHERE table_name = ?"
+        )
 
-        with self._get_connection() as ctx:
-            result = ctx.execute_query(describe_query)
+        result = self._query_schema(self._columns_cache, table, describe_query)
 
         columns_info = []
         for row in result:
@@ -130,38 +201,70 @@ class SnowflakeMockClient:
 
     def get_primary_key(self, table: str) -> list[str]:
         """Get primary key columns for a table"""
-        pk_query = f"""
+        pk_query = """
         SELECT column_name 
         FROM information_schema.table_constraints tc
         JOIN information_schema.key_column_usage kcu 
         ON tc.constraint_name = kcu.constraint_name
-        WHERE tc.table_name = '{table}' 
+        WHERE tc.table_name = ? 
         AND tc.constraint_type = 'PRIMARY KEY'
         """
 
-        with self._get_connection() as ctx:
-            result = ctx.execute_query(pk_query)
+        result = self._query_schema(self._primary_key_cache, table, pk_query)
 
         return [row["column_name"] for row in result]
 
+    def _query_schema(
+        self, cache: dict[str, tuple[float, list[dict]]], table: str, query: str
+    ) -> list[dict]:
+        """Run an introspection query for a table, reusing recent results"""
+        now = time.monotonic()
+        cached = cache.get(table)
+        if cached is not None and now - cached[0] < _SCHEMA_CACHE_TTL:
+            return cached[1]
+
+        with self._get_connection() as ctx:
+            result = ctx.execute_query(query, [table])
+
+        cache[table] = (now, result)
+        return result
+
+    def invalidate(self, table: str | None = None) -> None:
+        """Drop cached introspection results for a table, or for all tables"""
+        if table is None:
+            self._columns_cache.clear()
+            self._primary_key_cache.clear()
+        else:
+            self._columns_cache.pop(table, None)
+            self._primary_key_cache.pop(table, None)
+
     def close(self):
         """Close the connection"""
         if self.connection_id:
             try:
-                requests.delete(f"{self.proxy_url}/v1/connection/{self.connection_id}")
+                self.session.delete(
+                    f"{self.proxy_url}/v1/connection/{self.connection_id}"
+                )
                 self.connection_id = None
                 self.log.info("Connection closed")
             except Exception as e:
-                self.log.error(f"Error closing connection: {str(e)}")
+                self.log.error("Error closing connection: %s", e)
 
 
 class SnowflakeMockConnection:
     """Mock Snowflake connection that uses the local proxy"""
 
-    def __init__(self, connection_id: str, proxy_url: str, logger):
+    def __init__(
+        self,
+        connection_id: str,
+        proxy_url: str,
+        logger,
+        session: requests.Session | None = None,
+    ):
         self.connection_id = connection_id
         self.proxy_url = proxy_url
         self.log = logger
+        self.session = session or requests.Session()
 
     def __enter__(self):
         return self
@@ -185,19 +288,66 @@ class SnowflakeMockConnection:
             "debug": debug_translation,
         }
 
-        response = requests.post(
+        response = self.session.post(
             f"{self.proxy_url}/v1/query",
             json=payload,
-            headers={"Content-Type": "application/json"},
         )
 
         if response.status_code != 200:
             raise Exception(f"Query execution failed: {response.text}")
 
-        result = response.json()
+        result = orjson.loads(response.content)
         if not result["success"]:
             raise Exception(
                 f"Query execution failed: {result.get('error', 'Unknown error')}"
             )
 
         return result["result"]
+
+    def execute_many(self, queries: list[str | tuple[str, Any]]) -> list[Any]:
+        """Execute several queries through the proxy in a single request"""
+        payload = {
+            "connection_id": self.connection_id,
+            "queries": [
+                {"query": query[0], "params": query[1]}
+                if isinstance(query, tuple)
+                else {"query": query}
+                for query in queries
+            ],
+        }
+
+        response = self.session.post(
+            f"{self.proxy_url}/v1/query_batch",
+            json=payload,
+        )
+
+        if response.status_code != 200:
+            raise Exception(f"Query batch execution failed: {response.text}")
+
+        result = orjson.loads(response.content)
+        if not result["success"]:
+            raise Exception(
+                f"Query batch execution failed: {result.get('error', 'Unknown error')}"
+            )
+
+        return result["results"]
+
+    def stream_query(self, query: str, data: Any = None) -> Iterator[dict]:
+        """Execute a query through the proxy, yielding rows as they are streamed"""
+        payload = {
+            "connection_id": self.connection_id,
+            "query": query,
+            "params": data,
+        }
+
+        with self.session.post(
+            f"{self.proxy_url}/v1/query_stream",
+            json=payload,
+            stream=True,
+        ) as response:
+            if response.status_code != 200:
+                raise Exception(f"Query execution failed: {response.text}")
+
+            for line in response.iter_lines():
+                if line:
+                    yield orjson.loads(line)
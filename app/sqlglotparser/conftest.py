@@ -0,0 +1,12 @@
+"""
+Shared fixtures for the SQLGlot parser tests.
+"""
+
+import pytest
+from sqlglotparser.sqlglot_parser import SQLGlotParser
+
+
+@pytest.fixture(scope="session")
+def sqlglot_parser():
+    """A single Snowflake parser shared by every test, as the proxy does."""
+    return SQLGlotParser()
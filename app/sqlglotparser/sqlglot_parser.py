@@ -2,12 +2,359 @@
 SQLGlot parser implementation for SQL query validation and parsing.
 """
 
-from typing import Any, Dict
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-from sqlglot import parse as sqlglot_parse
+from sqlglot import exp
+from sqlglot.dialects.dialect import Dialect
+from sqlglot.errors import ParseError
+from sqlglot.tokens import Token, TokenType
+
+# Number of distinct queries whose translation is kept in memory
+_TRANSLATION_CACHE_SIZE = int(os.environ.get("SQLGLOT_TRANSLATION_CACHE_SIZE", "4096"))
+
+# Queries longer than this many characters are translated without being
+# cached, so large one-off statements (bulk INSERTs) cannot pin memory
+_TRANSLATION_CACHE_MAX_QUERY_LENGTH = int(
+    os.environ.get("SQLGLOT_TRANSLATION_CACHE_MAX_QUERY_LENGTH", "65536")
+)
+
+# Map common dialect names to SQLGlot dialect names
+_DIALECT_MAP = MappingProxyType(
+    {
+        "snowflake": "snowflake",
+        "postgres": "postgres",
+    }
+)
+
+# Batches smaller than this are parsed in-process, as starting worker
+# processes would cost more than it saves
+_SERIAL_BATCH_SIZE = 8
+
+# One-character codes for the tokens a portable query may be made of
+_PORTABLE_TOKEN_CODES = MappingProxyType(
+    {
+        TokenType.SELECT: "S",
+        TokenType.FROM: "F",
+        TokenType.WHERE: "W",
+        TokenType.LIMIT: "L",
+        TokenType.ALIAS: "a",
+        TokenType.VAR: "i",
+        TokenType.NUMBER: "n",
+        TokenType.STRING: "s",
+        TokenType.COMMA: ",",
+        TokenType.DOT: ".",
+        TokenType.STAR: "*",
+        TokenType.EQ: "=",
+        TokenType.NEQ: "=",
+        TokenType.LT: "=",
+        TokenType.LTE: "=",
+        TokenType.GT: "=",
+        TokenType.GTE: "=",
+        TokenType.AND: "&",
+        TokenType.OR: "&",
+        TokenType.SEMICOLON: ";",
+    }
+)
+
+# SELECT <columns> [FROM <table> [WHERE <comparisons>]] [LIMIT <n>] over the
+# token codes above: plain column lists, comparisons and literals that read
+# the same in every dialect we translate between
+_IDENTIFIER = r"i(?:\.i)*"
+_OPERAND = rf"(?:{_IDENTIFIER}|n|s)"
+# Column aliases need AS: some keywords (day, year, ...) are rejected by
+# PostgreSQL as bare column labels
+_SELECT_ITEM = rf"(?:\*|{_OPERAND}(?:ai)?)"
+_COMPARISON = rf"{_OPERAND}={_OPERAND}"
+_PORTABLE_QUERY_RE = re.compile(
+    rf"S{_SELECT_ITEM}(?:,{_SELECT_ITEM})*"
+    rf"(?:F{_IDENTIFIER}(?:a?i)?(?:W{_COMPARISON}(?:&{_COMPARISON})*)?)?"
+    r"(?:Ln)?;?"
+)
+
+# (source, target) dialect pairs for which a portable query reads the same
+# in both, so it can be passed through without translation. Other targets
+# spell LIMIT, string escapes, != or implicit aliases differently
+_PORTABLE_DIALECT_PAIRS = frozenset({("snowflake", "postgres")})
+
+# Target dialects that spell SELECT TOP <n> as a trailing LIMIT <n>
+_LIMIT_DIALECTS = frozenset({"postgres"})
+
+# Tokens after which a number or string literal is templated out of a query
+_TEMPLATE_OPERATORS = frozenset(
+    {
+        TokenType.EQ,
+        TokenType.NEQ,
+        TokenType.LT,
+        TokenType.LTE,
+        TokenType.GT,
+        TokenType.GTE,
+    }
+)
+
+# Queries containing these tokens are never templated
+_TEMPLATE_BLOCKERS = frozenset(
+    {
+        TokenType.CREATE,
+        TokenType.ALTER,
+        TokenType.DROP,
+        TokenType.WITH,
+        TokenType.SEMICOLON,
+    }
+)
+
+# Prefix of the string literals standing in for templated-out literals
+_TEMPLATE_SENTINEL = "__sqlglot_literal_"
+
+
+@lru_cache(maxsize=None)
+def _get_dialect(name: Optional[str]) -> Dialect:
+    """
+    Resolve a dialect name to a shared Dialect instance.
+
+    Dialect instances build a fresh tokenizer, parser and generator on every
+    call, so one instance per name can be shared by all threads.
+    """
+    return Dialect.get_or_raise(name)
+
+
+def _is_portable(tokens: List[Token], sql_query: str) -> bool:
+    """
+    Check whether a query only uses syntax that needs no translation.
+
+    This only looks at the query's tokens, which is much cheaper than
+    parsing it and generating it back. Anything outside the simple SELECT
+    shape above, comments, and strings using backslash escapes or dollar
+    quoting all take the full translation path.
+    """
+    codes = []
+    for token in tokens:
+        code = _PORTABLE_TOKEN_CODES.get(token.token_type)
+        if code is None or token.comments:
+            return False
+        if code == "s" and not _is_plain_string(token, sql_query):
+            return False
+        codes.append(code)
+    return _PORTABLE_QUERY_RE.fullmatch("".join(codes)) is not None
+
+
+def _is_plain_string(token: Token, sql_query: str) -> bool:
+    """Check that a string token is single-quoted without backslash escapes"""
+    raw = sql_query[token.start : token.end + 1]
+    return raw.startswith("'") and "\\" not in raw
+
+
+def _rewrite_top(tokens: List[Token], sql_query: str) -> Optional[str]:
+    """
+    Rewrite SELECT TOP <n> into a trailing LIMIT <n> without parsing.
+
+    Only applies to a single statement whose rest is portable and has no
+    LIMIT of its own; returns None otherwise so the query is fully translated.
+    """
+    if len(tokens) < 4 or tokens[1].token_type != TokenType.TOP:
+        return None
+    count = tokens[2]
+    if (
+        count.token_type != TokenType.NUMBER
+        or tokens[1].comments
+        or count.comments
+        or any(
+            token.token_type in (TokenType.LIMIT, TokenType.SEMICOLON)
+            for token in tokens
+        )
+        or not _is_portable([tokens[0], *tokens[3:]], sql_query)
+    ):
+        return None
+    return (
+        f"{sql_query[: tokens[1].start]}{sql_query[tokens[3].start :]}"
+        f" LIMIT {count.text}"
+    )
+
+
+def _template(
+    tokens: List[Token], sql_query: str
+) -> Optional[Tuple[str, List[exp.Literal]]]:
+    """
+    Replace the literals compared against in a query with sentinel strings.
+
+    Queries such as "... WHERE id = 1" and "... WHERE id = 2" then share one
+    template, which is translated once. Only literals directly after a
+    comparison operator are replaced, since elsewhere a literal can change
+    how the query parses (date parts, format strings, etc.). DDL and CTEs
+    and multi-statement queries are left alone. Returns None when there is
+    nothing to template.
+    """
+    if _TEMPLATE_SENTINEL in sql_query:
+        return None
+
+    pieces = []
+    literals = []
+    position = 0
+    previous = None
+    for token in tokens:
+        if token.token_type in _TEMPLATE_BLOCKERS:
+            return None
+        if previous in _TEMPLATE_OPERATORS and (
+            token.token_type == TokenType.NUMBER
+            or (
+                token.token_type == TokenType.STRING
+                and _is_plain_string(token, sql_query)
+            )
+        ):
+            pieces.append(sql_query[position : token.start])
+            pieces.append(f"'{_TEMPLATE_SENTINEL}{len(literals)}'")
+            position = token.end + 1
+            literals.append(
+                exp.Literal.number(token.text)
+                if token.token_type == TokenType.NUMBER
+                else exp.Literal.string(token.text)
+            )
+        previous = token.token_type
+
+    if not literals:
+        return None
+    pieces.append(sql_query[position:])
+    return "".join(pieces), literals
+
+
+def _restore(
+    sql_output: str, literals: List[exp.Literal], target_dialect: str
+) -> Optional[str]:
+    """
+    Put templated-out literals back into a translated template.
+
+    Returns None if a sentinel did not come out of the translation exactly
+    once, in which case the query has to be translated on its own.
+    """
+    generator = _get_dialect(target_dialect)
+    for index, literal in enumerate(literals):
+        sentinel = f"'{_TEMPLATE_SENTINEL}{index}'"
+        if sql_output.count(sentinel) != 1:
+            return None
+        sql_output = sql_output.replace(sentinel, generator.generate(literal))
+    return sql_output
+
+
+def _transpile(
+    dialect: Dialect, target_dialect: str, tokens: List[Token], sql_query: str
+) -> Tuple[str, ...]:
+    """Parse a tokenized query and generate each statement in the target dialect"""
+    parsed = dialect.parser().parse(tokens, sql_query)
+    generator = _get_dialect(target_dialect).generator()
+    # The trees were just parsed and are not used again, so the generator may
+    # work on them directly instead of on deep copies
+    return tuple(
+        generator.generate(statement, copy=False)
+        for statement in parsed
+        if statement is not None
+    )
+
+
+def _split(tokens: List[Token], sql_query: str) -> Tuple[str, ...]:
+    """
+    Split a tokenized query into its statements, as written.
+
+    Statements are cut at semicolon tokens, so semicolons inside string
+    literals or comments are left alone. Empty statements are dropped.
+    """
+    statements = []
+    start = 0
+    has_tokens = False
+    for token in tokens:
+        if token.token_type != TokenType.SEMICOLON:
+            has_tokens = True
+            continue
+        if has_tokens:
+            statements.append(sql_query[start : token.start].strip())
+        start = token.end + 1
+        has_tokens = False
+    if has_tokens:
+        statements.append(sql_query[start:].strip())
+    return tuple(statements)
+
+
+@lru_cache(maxsize=_TRANSLATION_CACHE_SIZE)
+def _translate_template(source_dialect: str, target_dialect: str, template: str) -> str:
+    """Translate a single-statement query template, memoized on its inputs"""
+    dialect = _get_dialect(source_dialect)
+    (sql_output,) = _transpile(
+        dialect, target_dialect, dialect.tokenize(template), template
+    )
+    return sql_output
+
+
+def _normalize(sql_query: str) -> str:
+    """
+    Normalize a query so trivially different spellings share a cache entry.
+
+    Only surrounding whitespace and trailing semicolons are removed; inner
+    whitespace is kept since it may be part of a string literal.
+    """
+    return sql_query.strip().rstrip(";").rstrip()
+
+
+@lru_cache(maxsize=_TRANSLATION_CACHE_SIZE)
+def _translate(
+    source_dialect: str, target_dialect: Optional[str], sql_query: str
+) -> Tuple[str, ...]:
+    """
+    Parse a query and generate its statements back as SQL, memoized on its inputs.
+
+    Translation is a pure function of the dialects and the query text, so
+    clients replaying the same statements only pay the parse once. Errors
+    are not cached and propagate to the caller every time. Queries that
+    stay in their own dialect are returned as written. So are queries with
+    nothing dialect-specific in them, for the pairs in
+    _PORTABLE_DIALECT_PAIRS, where a leading SELECT TOP is also moved to a
+    LIMIT without parsing when that is all the query needs.
+    """
+    dialect = _get_dialect(source_dialect)
+    tokens = dialect.tokenize(sql_query)
+    if target_dialect in (None, source_dialect):
+        # Nothing to translate: parse only to validate the query
+        dialect.parser().parse(tokens, sql_query)
+        return _split(tokens, sql_query)
+    if (source_dialect, target_dialect) in _PORTABLE_DIALECT_PAIRS:
+        if _is_portable(tokens, sql_query):
+            return (sql_query,)
+        if target_dialect in _LIMIT_DIALECTS:
+            rewritten = _rewrite_top(tokens, sql_query)
+            if rewritten is not None:
+                return (rewritten,)
+
+    templated = (
+        _template(tokens, sql_query)
+        if len(sql_query) <= _TRANSLATION_CACHE_MAX_QUERY_LENGTH
+        else None
+    )
+    if templated is not None:
+        template, literals = templated
+        try:
+            sql_output = _restore(
+                _translate_template(source_dialect, target_dialect, template),
+                literals,
+                target_dialect,
+            )
+        except ParseError:
+            # Let the full translation below report the error for the query
+            sql_output = None
+        if sql_output is not None:
+            return (sql_output,)
+
+    # Parse the tokens already produced for the portability check
+    return _transpile(dialect, target_dialect, tokens, sql_query)
 
 
 class SQLGlotParser:
+    # A single instance is shared by every request thread, so its state is
+    # read-only after __init__ and memoization lives in the module-level
+    # lru_cache, which is safe to call concurrently
+    __slots__ = ("dialect", "_src_name")
+
     def __init__(self, dialect: str = "snowflake"):
         """
         Initialize SQLGlot parser with specified dialect.
@@ -17,13 +364,10 @@ class SQLGlotParser:
                           (default: 'snowflake')
         """
         self.dialect = dialect.lower()
-        # Map common dialect names to SQLGlot dialect classes
-        self.dialect_map = {
-            "snowflake": "snowflake",
-            "postgres": "postgres",
-        }
+        # Resolved once here rather than on every parse
+        self._src_name = _DIALECT_MAP.get(self.dialect, "snowflake")
 
-    def parse(self, sql_query: str, target_dialect: str = None) -> Dict[str, Any]:
+    def parse(self, sql_query: str, target_dialect: str = None) -> Mapping[str, Any]:
         """
         Parse SQL query using SQLGlot and optionally translate to another dialect.
 
@@ -33,31 +377,108 @@ class SQLGlotParser:
                                           If None, no translation is performed.
 
         Returns:
-            Dict[str, Any]: Dictionary containing parsing results and translated SQL
+            Mapping[str, Any]: Read-only mapping containing parsing results and
+                               translated SQL. Multi-statement queries are
+                               joined with ";\\n" and also listed one by one
+                               under "statements". The mapping and its values
+                               are immutable, so results can be shared freely.
 
         Raises:
-            Exception: If the query cannot be parsed or contains errors
+            ParseError: If the query cannot be parsed or contains errors
         """
-        try:
-            source_dialect = self.dialect_map.get(self.dialect, "snowflake")
-            parsed = sqlglot_parse(sql_query, read=source_dialect)
+        # If target dialect is specified, generate SQL in that dialect
+        if target_dialect:
+            target_dialect = _DIALECT_MAP.get(target_dialect, target_dialect)
+        sql_query = _normalize(sql_query)
+        translate = (
+            _translate
+            if len(sql_query) <= _TRANSLATION_CACHE_MAX_QUERY_LENGTH
+            else _translate.__wrapped__
+        )
+        statements = translate(self._src_name, target_dialect, sql_query)
+        sql_output = ";\n".join(statements)
 
-            # If target dialect is specified, generate SQL in that dialect
-            sql_output = None
-            if target_dialect:
-                target_dialect = self.dialect_map.get(target_dialect, target_dialect)
-                sql_output = parsed[0].sql(dialect=target_dialect)
-            else:
-                sql_output = parsed[0].sql()
-
-            # Convert the parse result to a dictionary format
-            result = {
+        # Convert the parse result to a read-only mapping
+        return MappingProxyType(
+            {
                 "tree": sql_output,
-                "violations": [],  # SQLGlot doesn't have built-in linting
+                "statements": statements,
+                "violations": (),  # SQLGlot doesn't have built-in linting
                 "success": True,
                 "translated_sql": sql_output if target_dialect else None,
             }
-            return result
+        )
+
+    def parse_many(
+        self,
+        queries: List[str],
+        target_dialect: str = None,
+        workers: Optional[int] = None,
+    ) -> List[Mapping[str, Any]]:
+        """
+        Parse several SQL queries, spreading them over worker processes.
+
+        Parsing is CPU-bound and holds the GIL, so threads would not run it
+        in parallel; separate processes do.
+
+        Args:
+            queries (List[str]): SQL query strings to parse
+            target_dialect (str, optional): Target SQL dialect to translate to.
+                                          If None, no translation is performed.
+            workers (int, optional): Number of worker processes
+                                   (default: number of CPUs)
+
+        Returns:
+            List[Mapping[str, Any]]: Parsing results, in the same order as queries
+        """
+        if len(queries) < _SERIAL_BATCH_SIZE:
+            return [self.parse(query, target_dialect) for query in queries]
+
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.dialect, target_dialect),
+        ) as executor:
+            # Workers send back plain dicts, as mapping proxies cannot be
+            # pickled
+            return [
+                MappingProxyType(result)
+                for result in executor.map(
+                    _parse_in_worker,
+                    queries,
+                    chunksize=max(1, len(queries) // (workers * 4)),
+                )
+            ]
+
+
+# Parser and target dialect of the current parse_many worker process
+_worker_parser: Optional[SQLGlotParser] = None
+_worker_target_dialect: Optional[str] = None
+
+
+def _init_worker(dialect: str, target_dialect: Optional[str]) -> None:
+    """Create the parser used by a parse_many worker process"""
+    global _worker_parser, _worker_target_dialect
+    _worker_parser = SQLGlotParser(dialect)
+    _worker_target_dialect = target_dialect
+
+
+def _parse_in_worker(sql_query: str) -> Dict[str, Any]:
+    """Parse a single query inside a parse_many worker process"""
+    return dict(_worker_parser.parse(sql_query, target_dialect=_worker_target_dialect))
+
+
+def _prewarm() -> None:
+    """
+    Load the dialects up front so the first request does not pay for it.
+
+    sqlglot imports a dialect's module and builds its tokenizer and parser
+    tables the first time the dialect is used.
+    """
+    _get_dialect("snowflake").parse("SELECT 1")
+    _get_dialect("postgres").generate(exp.select("1"))
+
 
-        except Exception as e:
-            raise e
+if os.environ.get("SNOWFLAKE_PROXY_PREWARM", "1") == "1":
+    _prewarm()
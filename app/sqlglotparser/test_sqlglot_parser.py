@@ -5,7 +5,11 @@ Test cases for SQLGlot parser implementation.
 import pytest
 from sqlglot import ParseError
 
-from snowflake_proxy.sqlglotparser.sqlglot_parser import SQLGlotParser
+from sqlglotparser.sqlglot_parser import (
+    SQLGlotParser,
+    _translate,
+    _translate_template,
+)
 
 
 def test_sqlglot_parser_initialization():
@@ -16,18 +20,89 @@ def test_sqlglot_parser_initialization():
     assert custom_parser.dialect == "postgres"
 
 
-def test_parse_valid_query():
-    parser = SQLGlotParser()
+def test_parse_valid_query(sqlglot_parser):
     query = "SELECT column1, column2 FROM my_table WHERE column1 > 0;"
 
-    result = parser.parse(query)
-    print(result)
+    result = sqlglot_parser.parse(query)
+    assert result["success"]
+    assert result["tree"] == query.rstrip(";")
+
+    with pytest.raises(TypeError):
+        result["tree"] = "SELECT 1"
+
 
+def test_parse_same_dialect_returns_query_as_written(sqlglot_parser):
+    """Test that parsing without translating skips SQL generation."""
+    query = "SELECT IFF(column1 > 0, 'a', 'b') FROM my_table"
 
-def test_parse_invalid_query():
+    assert sqlglot_parser.parse(query)["tree"] == query
+    result = sqlglot_parser.parse(query, target_dialect="snowflake")
+    assert result["translated_sql"] == query
+
+
+def test_parse_invalid_query(sqlglot_parser):
     """Test that invalid SQL raises appropriate parsing error."""
-    parser = SQLGlotParser()
     query = "SOsLECT column1, column2 FROM my_table WHERE column1 > 0;"
 
     with pytest.raises(ParseError):
-        parser.parse(query)
+        sqlglot_parser.parse(query)
+
+
+def test_parse_repeated_query_is_cached(sqlglot_parser):
+    """Test that translating the same query twice reuses the cached output."""
+    query = "SELECT NVL(column1, 0) FROM cached_table"
+
+    first = sqlglot_parser.parse(query, target_dialect="postgres")
+    hits = _translate.cache_info().hits
+    second = sqlglot_parser.parse(query, target_dialect="postgres")
+
+    assert _translate.cache_info().hits == hits + 1
+    assert first == second
+
+
+def test_parse_trailing_semicolon_shares_cache_entry(sqlglot_parser):
+    """Test that surrounding whitespace and semicolons do not defeat the cache."""
+    sqlglot_parser.parse(
+        "SELECT IFF(a > 0, 1, 2) FROM shared_table", target_dialect="postgres"
+    )
+    misses = _translate.cache_info().misses
+
+    sqlglot_parser.parse(
+        "  SELECT IFF(a > 0, 1, 2) FROM shared_table;\n", target_dialect="postgres"
+    )
+
+    assert _translate.cache_info().misses == misses
+
+
+def test_parse_long_query_is_not_cached(sqlglot_parser, monkeypatch):
+    """Test that queries over the length limit bypass the translation cache."""
+    monkeypatch.setattr(
+        "sqlglotparser.sqlglot_parser._TRANSLATION_CACHE_MAX_QUERY_LENGTH", 32
+    )
+    query = "SELECT NVL(column1, 0) FROM uncached_table WHERE id = 1"
+    size = _translate.cache_info().currsize
+    template_size = _translate_template.cache_info().currsize
+
+    result = sqlglot_parser.parse(query, target_dialect="postgres")
+
+    assert result["translated_sql"] == (
+        "SELECT COALESCE(column1, 0) FROM uncached_table WHERE id = 1"
+    )
+    assert _translate.cache_info().currsize == size
+    assert _translate_template.cache_info().currsize == template_size
+
+
+def test_parse_multi_statement(sqlglot_parser):
+    """Test that every statement of a script is kept, not just the first."""
+    query = "SELECT IFF(a > 0, 1, 2) FROM t1; SELECT NVL(b, 0) FROM t2;"
+
+    result = sqlglot_parser.parse(query, target_dialect="postgres")
+
+    assert result["statements"] == (
+        "SELECT CASE WHEN a > 0 THEN 1 ELSE 2 END FROM t1",
+        "SELECT COALESCE(b, 0) FROM t2",
+    )
+    assert result["translated_sql"] == ";\n".join(result["statements"])
+
+    result = sqlglot_parser.parse("SELECT 'a;b' FROM t1;; SELECT 2")
+    assert result["statements"] == ("SELECT 'a;b' FROM t1", "SELECT 2")
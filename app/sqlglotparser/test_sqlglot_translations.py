@@ -2,16 +2,18 @@
 Test cases for SQLGlot SQL translation functionality.
 """
 
+import os
+
 import pytest
-from snowflake_proxy.sqlglotparser.sqlglot_parser import SQLGlotParser
+import sqlglot
+from sqlglotparser.sqlglot_parser import _translate_template
 
 
-def test_translate_simple_select():
+def test_translate_simple_select(sqlglot_parser):
     """Test translating a simple SELECT query from Snowflake to PostgreSQL."""
-    parser = SQLGlotParser()
     snowflake_query = "SELECT column1, column2 FROM my_table WHERE column1 > 0;"
 
-    result = parser.parse(snowflake_query, target_dialect="postgres")
+    result = sqlglot_parser.parse(snowflake_query, target_dialect="postgres")
 
     assert result["success"], "Query should be parsed successfully"
     assert result["translated_sql"] is not None, "Translated SQL should not be None"
@@ -23,9 +25,68 @@ def test_translate_simple_select():
     )
 
 
-def test_translate_snowflake_specific_functions():
+def test_translate_portable_query_is_returned_as_written(sqlglot_parser):
+    """Test that a query with no Snowflake-specific syntax skips translation."""
+    snowflake_query = "SELECT a, b AS c FROM my_table t WHERE a <> 1 AND b = 'x';"
+
+    result = sqlglot_parser.parse(snowflake_query, target_dialect="postgres")
+
+    assert result["translated_sql"] == (
+        "SELECT a, b AS c FROM my_table t WHERE a <> 1 AND b = 'x'"
+    )
+
+
+def test_translate_bare_column_alias_gets_as(sqlglot_parser):
+    """Test that aliases without AS are translated, as some are keywords."""
+    result = sqlglot_parser.parse("SELECT a day FROM t", target_dialect="postgres")
+
+    assert result["translated_sql"] == "SELECT a AS day FROM t"
+
+
+def test_translate_top_matches_full_translation(sqlglot_parser):
+    """Test that the SELECT TOP shortcut agrees with sqlglot's translation."""
+    for snowflake_query in (
+        "SELECT TOP 10 * FROM my_table",
+        "SELECT TOP 5 a, b AS c FROM my_table WHERE a = 1;",
+        "SELECT TOP 5 a FROM my_table LIMIT 3",
+        "SELECT TOP 5 NVL(a, 0) FROM my_table",
+        "SELECT TOP 5 a year FROM my_table",
+    ):
+        result = sqlglot_parser.parse(snowflake_query, target_dialect="postgres")
+
+        (expected,) = sqlglot.transpile(
+            snowflake_query, read="snowflake", write="postgres"
+        )
+        assert result["translated_sql"] == expected
+
+
+def test_translate_portable_query_to_other_dialects_is_translated(sqlglot_parser):
+    """Test that the pass-through only applies to snowflake to postgres."""
+    for snowflake_query, target_dialect in (
+        ("SELECT a FROM my_table LIMIT 5", "tsql"),
+        ("SELECT a FROM my_table LIMIT 5", "oracle"),
+        ("SELECT a FROM my_table WHERE b = 'it''s'", "bigquery"),
+        ("SELECT a FROM my_table WHERE b = 1", "tsql"),
+    ):
+        result = sqlglot_parser.parse(snowflake_query, target_dialect=target_dialect)
+
+        (expected,) = sqlglot.transpile(
+            snowflake_query, read="snowflake", write=target_dialect
+        )
+        assert result["translated_sql"] == expected
+
+
+def test_translate_placeholder_is_not_returned_as_written(sqlglot_parser):
+    """Test that bind placeholders still go through the full translation."""
+    snowflake_query = "SELECT a FROM my_table WHERE b = ?"
+
+    result = sqlglot_parser.parse(snowflake_query, target_dialect="postgres")
+
+    assert result["translated_sql"] == "SELECT a FROM my_table WHERE b = %s"
+
+
+def test_translate_snowflake_specific_functions(sqlglot_parser):
     """Test translating Snowflake-specific functions to PostgreSQL equivalents."""
-    parser = SQLGlotParser()
     snowflake_query = """
     SELECT 
         DATEADD(day, 1, current_date()),
@@ -34,7 +95,7 @@ def test_translate_snowflake_specific_functions():
     FROM my_table;
     """
 
-    result = parser.parse(snowflake_query, target_dialect="postgres")
+    result = sqlglot_parser.parse(snowflake_query, target_dialect="postgres")
     assert result["success"], "Query should be parsed successfully"
     assert result["translated_sql"] is not None, "Translated SQL should not be None"
 
@@ -45,18 +106,49 @@ def test_translate_snowflake_specific_functions():
     assert "to_char" in translated, "Should translate TO_VARCHAR to TO_CHAR"
 
 
-def test_translate_invalid_query():
+def test_translate_queries_differing_in_literals_share_template(sqlglot_parser):
+    """Test that compared-against literals are substituted into a shared template."""
+    template_query = "SELECT NVL(total, 0) FROM orders WHERE id = {} AND status = '{}'"
+
+    sqlglot_parser.parse(template_query.format(1, "open"), target_dialect="postgres")
+    misses = _translate_template.cache_info().misses
+    result = sqlglot_parser.parse(
+        template_query.format(2, "it''s"), target_dialect="postgres"
+    )
+
+    assert _translate_template.cache_info().misses == misses
+    assert result["translated_sql"] == (
+        "SELECT COALESCE(total, 0) FROM orders WHERE id = 2 AND status = 'it''s'"
+    )
+
+
+def test_translate_many_matches_single_translations(sqlglot_parser):
+    """Test that batch translation returns the same results, in order."""
+    snowflake_queries = [
+        f"SELECT NVL(column{i}, {i}) FROM my_table WHERE column1 > {i}"
+        for i in range(10)
+    ]
+
+    results = sqlglot_parser.parse_many(
+        snowflake_queries, target_dialect="postgres", workers=2
+    )
+
+    assert results == [
+        sqlglot_parser.parse(query, target_dialect="postgres")
+        for query in snowflake_queries
+    ]
+
+
+def test_translate_invalid_query(sqlglot_parser):
     """Test that invalid SQL raises appropriate parsing error."""
-    parser = SQLGlotParser()
     invalid_query = "SELECT * FORM my_table;"  # FORM is misspelled
 
     with pytest.raises(Exception):
-        parser.parse(invalid_query, target_dialect="postgres")
+        sqlglot_parser.parse(invalid_query, target_dialect="postgres")
 
 
-def test_translate_complex_select():
+def test_translate_complex_select(sqlglot_parser, tmp_path):
     """Test translating a simple SELECT query from Snowflake to PostgreSQL."""
-    parser = SQLGlotParser()
     snowflake_query = """
         WITH daily_stats AS (
     SELECT 
@@ -87,13 +179,14 @@ WHERE is_complex_agent = TRUE
 ORDER BY event_date DESC, event_count DESC;
         """
 
-    result = parser.parse(snowflake_query, target_dialect="postgres")
+    result = sqlglot_parser.parse(snowflake_query, target_dialect="postgres")
 
     assert result["success"], "Query should be parsed successfully"
     assert result["translated_sql"] is not None, "Translated SQL should not be None"
 
-    with open("translated_query.sql", "w") as f:
-        f.write(result["translated_sql"])
+    # Set DUMP_TRANSLATED to keep the translated query for inspection
+    if os.environ.get("DUMP_TRANSLATED"):
+        (tmp_path / "translated_query.sql").write_text(result["translated_sql"])
 
     # The translated query should be valid PostgreSQL but functionally equivalent
     expected = "WITH daily_stats AS (SELECT event_date, user_id, user_agent, event_count, is_complex_agent, prev_day_count, rank FROM (SELECT DATE_TRUNC('DAY', event_timestamp) AS event_date, user_id, CAST(JSON_EXTRACT_PATH(CAST(event_data AS JSON), 'user_agent') AS TEXT) AS user_agent /* Snowflake JSON access */, COUNT(*) AS event_count, CASE WHEN ARRAY_LENGTH(SPLIT(user_agent, ' '), 1) > 2 THEN TRUE ELSE FALSE END AS is_complex_agent /* Snowflake functions */, LAG(event_count, 1, 0) OVER (PARTITION BY user_id ORDER BY event_date) AS prev_day_count, ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY event_count DESC) AS rank FROM raw_events WHERE event_timestamp >= CURRENT_TIMESTAMP + INTERVAL '-7 DAY' /* Snowflake date arithmetic */) AS _t WHERE rank <= 3 /* Snowflake-specific QUALIFY clause */) SELECT event_date, user_id, user_agent, event_count, CASE WHEN prev_day_count IS NULL THEN 0 ELSE prev_day_count END AS prev_day_count /* Snowflake NULL handling */, CASE WHEN event_count > COALESCE(prev_day_count, 0) THEN 'Increased' /* Snowflake NVL function */ WHEN event_count < COALESCE(prev_day_count, 0) THEN 'Decreased' ELSE 'No Change' END AS trend FROM daily_stats WHERE is_complex_agent = TRUE ORDER BY event_date DESC, event_count DESC"
@@ -0,0 +1,141 @@
+"""
+Test cases for the proxy's Flask routes, using a stub connection handler
+instead of PostgreSQL.
+"""
+
+import pytest
+
+import app.app as proxy
+
+
+class StubConnectionHandler:
+    """Records the queries it is given instead of running them"""
+
+    def __init__(self):
+        self.batches = []
+        self.rows = []
+        self.error = None
+
+    def stream_query(self, connection_id, query, params=None):
+        return self._stream_rows()
+
+    def _stream_rows(self):
+        # Like a server-side cursor, fail only once rows are requested
+        if self.error is not None:
+            raise self.error
+        yield from self.rows
+
+    def execute_batch(self, connection_id, queries):
+        self.batches.append((connection_id, queries))
+        return [{"affected_rows": 1} for _ in queries]
+
+
+@pytest.fixture
+def connection_handler(monkeypatch):
+    handler = StubConnectionHandler()
+    monkeypatch.setattr(proxy, "connection_handler", handler)
+    return handler
+
+
+@pytest.fixture
+def client():
+    return proxy.app.test_client()
+
+
+def test_query_batch_executes_translated_queries_in_order(client, connection_handler):
+    """Test that a batch is translated and run as one call, in order."""
+    response = client.post(
+        "/v1/query_batch",
+        json={
+            "connection_id": "conn",
+            "queries": [
+                "SELECT 1",
+                {"query": "SELECT a FROM my_table WHERE b = ?", "params": [2]},
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()["results"] == [
+        {"affected_rows": 1},
+        {"affected_rows": 1},
+    ]
+    assert connection_handler.batches == [
+        (
+            "conn",
+            [
+                ("SELECT 1", None),
+                ("SELECT a FROM my_table WHERE b = %s", [2]),
+            ],
+        )
+    ]
+
+
+@pytest.mark.parametrize(
+    "queries",
+    [
+        "SELECT 1",
+        [5],
+        ["SELECT 1", 5],
+        [{"params": [1]}],
+        [{"query": 5}],
+        {"query": "SELECT 1"},
+        [],
+        None,
+    ],
+)
+def test_query_batch_rejects_malformed_queries(client, connection_handler, queries):
+    """Test that anything but a list of queries is rejected before running."""
+    response = client.post(
+        "/v1/query_batch", json={"connection_id": "conn", "queries": queries}
+    )
+
+    assert response.status_code == 400
+    assert not response.get_json()["success"]
+    assert connection_handler.batches == []
+
+
+def test_query_batch_requires_connection_id(client, connection_handler):
+    """Test that a batch without a connection is rejected."""
+    response = client.post("/v1/query_batch", json={"queries": ["SELECT 1"]})
+
+    assert response.status_code == 400
+    assert connection_handler.batches == []
+
+
+def test_query_stream_sends_one_json_row_per_line(client, connection_handler):
+    """Test that streamed rows are framed as newline-delimited JSON."""
+    connection_handler.rows = [{"id": 1, "name": "a"}, {"id": 2, "name": "b\nc"}]
+
+    response = client.post(
+        "/v1/query_stream", json={"connection_id": "conn", "query": "SELECT 1"}
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert response.get_data() == b'{"id":1,"name":"a"}\n{"id":2,"name":"b\\nc"}\n'
+
+
+def test_query_stream_empty_result(client, connection_handler):
+    """Test that a query without rows streams an empty body."""
+    response = client.post(
+        "/v1/query_stream", json={"connection_id": "conn", "query": "SELECT 1"}
+    )
+
+    assert response.status_code == 200
+    assert response.get_data() == b""
+
+
+def test_query_stream_error_on_first_row_returns_json(client, connection_handler):
+    """Test that a failing query still gets a JSON error response."""
+    connection_handler.error = RuntimeError("relation does not exist")
+
+    response = client.post(
+        "/v1/query_stream", json={"connection_id": "conn", "query": "SELECT 1"}
+    )
+
+    assert response.status_code == 500
+    assert response.get_json() == {
+        "success": False,
+        "error": "relation does not exist",
+    }
@@ -1,6 +1,10 @@
 import json
+import logging
 
 import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
 
 
 def test_connection():
@@ -10,36 +14,42 @@ def test_connection():
         "role": "ROLE_GROUP_TEAM_DATA_ENGINEER",
     }
 
-    # Test connection
-    print("Testing connection...")
-    response = requests.post(
-        "http://localhost:4566/v1/connection",
-        json=connection_params,
-        headers={"Content-Type": "application/json"},
-    )
-    print("Connection response:", response.json())
-
-    if response.status_code == 200:
-        connection_id = response.json().get("connection_id")
-
-        # Test simple query
-        print("\nTesting query...")
-        query_params = {"connection_id": connection_id, "query": "SELECT 1 as test"}
-        response = requests.post(
-            "http://localhost:4566/v1/query",
-            json=query_params,
-            headers={"Content-Type": "application/json"},
-        )
-        print("Query response:", response.json())
+    # One session keeps a single connection alive for all three requests
+    with requests.Session() as session:
+        session.headers.update({"Content-Type": "application/json"})
+        session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
 
-        # Close connection
-        print("\nClosing connection...")
-        response = requests.delete(
-            f"http://localhost:4566/v1/connection/{connection_id}",
-            headers={"Content-Type": "application/json"},
+        # Test connection
+        logger.debug("Testing connection...")
+        response = session.post(
+            "http://localhost:4566/v1/connection",
+            json=connection_params,
         )
-        print("Close response:", response.json())
+        logger.debug("Connection response: %s", response.json())
+
+        if response.status_code == 200:
+            connection_id = response.json().get("connection_id")
+
+            # Test simple query
+            logger.debug("Testing query...")
+            query_params = {
+                "connection_id": connection_id,
+                "query": "SELECT 1 as test",
+            }
+            response = session.post(
+                "http://localhost:4566/v1/query",
+                json=query_params,
+            )
+            logger.debug("Query response: %s", response.json())
+
+            # Close connection
+            logger.debug("Closing connection...")
+            response = session.delete(
+                f"http://localhost:4566/v1/connection/{connection_id}",
+            )
+            logger.debug("Close response: %s", response.json())
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
     test_connection()
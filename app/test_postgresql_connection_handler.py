@@ -0,0 +1,87 @@
+"""
+Test cases for the PostgreSQL connection handler, without a PostgreSQL server.
+"""
+
+import pytest
+from postgresql_connection_handler import (
+    PostgreSQLConnectionHandler,
+    _reset_connection,
+)
+from psycopg_pool import PoolTimeout
+
+
+class StubConnection:
+    """Records the statements executed on it"""
+
+    def __init__(self):
+        self.autocommit = False
+        self.executed = []
+
+    def execute(self, query):
+        self.executed.append((self.autocommit, query))
+
+
+class ExhaustedPool:
+    """A pool with no connection to give out"""
+
+    def __init__(self, pool_size, pool_available=0):
+        self.timeouts = []
+        self.stats = {"pool_size": pool_size, "pool_available": pool_available}
+
+    def getconn(self, timeout=None):
+        self.timeouts.append(timeout)
+        raise PoolTimeout("couldn't get a connection")
+
+    def get_stats(self):
+        return self.stats
+
+
+def test_create_connection_fails_fast_when_pool_is_exhausted():
+    """Test that an exhausted pool gives a clear error after the short timeout."""
+    handler = PostgreSQLConnectionHandler()
+    handler._pool = ExhaustedPool(pool_size=handler.pool_max_size)
+
+    with pytest.raises(RuntimeError, match="pooled connections are in use") as error:
+        handler.create_connection({})
+
+    assert isinstance(error.value.__cause__, PoolTimeout)
+    assert handler._pool.timeouts == [handler.pool_timeout]
+    assert handler.list_connections() == []
+    assert handler.connection_params == {}
+
+
+def test_create_connection_timeout_below_max_size_is_not_exhaustion():
+    """Test that a timeout with free pool slots is not reported as exhaustion."""
+    handler = PostgreSQLConnectionHandler()
+    handler._pool = ExhaustedPool(pool_size=handler.pool_min_size)
+
+    with pytest.raises(RuntimeError, match="Could not get a PostgreSQL connection"):
+        handler.create_connection({})
+
+
+def test_create_connection_unreachable_database(monkeypatch):
+    """Test that an unreachable PostgreSQL is not reported as exhaustion."""
+    monkeypatch.setenv("POSTGRES_HOST", "127.0.0.1")
+    monkeypatch.setenv("POSTGRES_PORT", "1")
+    monkeypatch.setenv("POSTGRES_POOL_TIMEOUT", "0.5")
+    handler = PostgreSQLConnectionHandler()
+
+    try:
+        with pytest.raises(
+            RuntimeError, match="check that PostgreSQL is reachable at 127.0.0.1:1"
+        ) as error:
+            handler.create_connection({})
+    finally:
+        handler._pool.close()
+
+    assert isinstance(error.value.__cause__, PoolTimeout)
+    assert handler.connection_params == {}
+
+
+def test_reset_connection_discards_session_state():
+    """Test that returned connections are cleared outside a transaction."""
+    connection = StubConnection()
+
+    _reset_connection(connection)
+
+    assert connection.executed == [(True, "DISCARD ALL")]
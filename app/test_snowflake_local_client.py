@@ -0,0 +1,142 @@
+"""
+Test cases for the local Snowflake client, with the proxy calls stubbed out.
+"""
+
+import pytest
+import snowflake_local_client
+from snowflake_local_client import SnowflakeMockClient, SnowflakeMockConnection
+
+
+@pytest.fixture
+def client():
+    client = SnowflakeMockClient()
+    # Skip creating a connection through the proxy
+    client.connection_id = "conn"
+    return client
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    """Record the batches sent to the proxy's /v1/query_batch endpoint"""
+    sent = []
+
+    def execute_many(self, queries):
+        sent.append(list(queries))
+        return [{"query": query} for query in queries]
+
+    monkeypatch.setattr(SnowflakeMockConnection, "execute_many", execute_many)
+    return sent
+
+
+def test_execute_many_sends_queries_in_chunks(client, batches):
+    """Test that queries are split into batch_size requests, keeping order."""
+    queries = [f"INSERT INTO t VALUES ({i})" for i in range(7)]
+
+    results = client.execute_many(queries, batch_size=3, verbose=False)
+
+    assert batches == [queries[0:3], queries[3:6], queries[6:7]]
+    assert results == [{"query": query} for query in queries]
+
+
+def test_execute_many_single_batch(client, batches):
+    """Test that a batch no larger than batch_size is sent in one request."""
+    queries = ["SELECT 1", ("SELECT ?", [2])]
+
+    client.execute_many(queries, batch_size=2, verbose=False)
+
+    assert batches == [queries]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A controllable replacement for time.monotonic"""
+    now = [1000.0]
+    monkeypatch.setattr(snowflake_local_client.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def schema_queries(monkeypatch, batches):
+    """Record the tables introspected through the proxy; other queries are no-ops"""
+    sent = []
+
+    def execute_query(self, query, data=None, return_dict=False, **kwargs):
+        if "information_schema" in query:
+            sent.append(data[0])
+            return [{"column_name": "id", "data_type": "integer"}]
+        return []
+
+    monkeypatch.setattr(SnowflakeMockConnection, "execute_query", execute_query)
+    return sent
+
+
+def test_schema_cache_reuses_results_until_ttl(client, clock, schema_queries):
+    """Test that introspection is cached per table for the TTL."""
+    client.get_columns_info("t1")
+    client.get_columns_info("t1")
+    client.get_primary_key("t1")
+    client.get_primary_key("t1")
+    assert schema_queries == ["t1", "t1"]
+
+    clock[0] += 59
+    client.get_columns_info("t1")
+    assert schema_queries == ["t1", "t1"]
+
+    clock[0] += 2
+    client.get_columns_info("t1")
+    client.get_primary_key("t1")
+    assert schema_queries == ["t1", "t1", "t1", "t1"]
+
+
+def test_schema_cache_invalidate(client, clock, schema_queries):
+    """Test that invalidate drops one table, or every table."""
+    client.get_columns_info("t1")
+    client.get_columns_info("t2")
+
+    client.invalidate("t1")
+    client.get_columns_info("t1")
+    client.get_columns_info("t2")
+    assert schema_queries == ["t1", "t2", "t1"]
+
+    client.invalidate()
+    client.get_columns_info("t1")
+    client.get_columns_info("t2")
+    assert schema_queries == ["t1", "t2", "t1", "t1", "t2"]
+
+
+@pytest.mark.parametrize(
+    "run",
+    [
+        lambda client: client.execute_query(
+            "ALTER TABLE t1 ADD COLUMN c INT", verbose=False
+        ),
+        lambda client: client.execute_many(
+            ["INSERT INTO t2 VALUES (1)", ("  drop table t2", None)], verbose=False
+        ),
+        lambda client: client.execute_query(
+            "INSERT INTO t1 VALUES (1);\nALTER TABLE t1 ADD COLUMN c INT",
+            verbose=False,
+        ),
+        lambda client: client.execute_many(
+            [("UPDATE t1 SET a = 1; drop table t2", None)], verbose=False
+        ),
+    ],
+)
+def test_schema_cache_cleared_by_ddl(client, clock, schema_queries, run):
+    """Test that running DDL drops cached introspection results."""
+    client.get_columns_info("t1")
+
+    run(client)
+    client.get_columns_info("t1")
+
+    assert schema_queries == ["t1", "t1"]
+
+
+def test_schema_cache_kept_by_dml(client, clock, schema_queries):
+    """Test that statements that are not DDL keep cached results."""
+    client.get_columns_info("t1")
+
+    client.execute_query("INSERT INTO t1 VALUES (1)", verbose=False)
+    client.get_columns_info("t1")
+
+    assert schema_queries == ["t1"]